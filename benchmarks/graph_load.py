@@ -0,0 +1,108 @@
+import os
+import sys
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+import networkx as nx
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(__file__)), 'src'))
+from graph import CityGraph
+
+def make_network(n_nodes, n_connections, seed=0):
+    """Gerar uma rede sintética com nós e conexões aleatórias"""
+    rng = np.random.default_rng(seed)
+
+    nodes = pd.DataFrame({
+        'node_id': np.arange(n_nodes),
+        'y': rng.uniform(-33, 5, n_nodes),
+        'x': rng.uniform(-74, -35, n_nodes),
+        'name': [f"Cidade {i}" for i in range(n_nodes)]
+    }).set_index('node_id')
+
+    connections = pd.DataFrame({
+        'u': rng.integers(0, n_nodes, n_connections),
+        'v': rng.integers(0, n_nodes, n_connections),
+        'distance': rng.uniform(50, 1500, n_connections)
+    })
+    return nodes, connections
+
+def build_per_edge(nodes, connections):
+    """Construção anterior: grafo não direcionado, uma chamada add_edge por conexão"""
+    graph = nx.Graph()
+    graph.graph['crs'] = 'epsg:4326'
+    for node_id, row in nodes.iterrows():
+        graph.add_node(node_id, y=row['y'], x=row['x'], name=row['name'])
+
+    speed_kmh = 80
+    for u, v, distance in connections[['u', 'v', 'distance']].itertuples(index=False):
+        graph.add_edge(u, v,
+                       length=distance * 1000,
+                       travel_time=(distance / speed_kmh) * 60 * 60,
+                       name=f"Railroad {u}-{v}",
+                       highway="railway")
+    return graph
+
+def build_per_edge_directed(nodes, connections):
+    """Mesma estrutura da construção atual (multigrafo direcionado), mas uma aresta por vez"""
+    graph = nx.MultiDiGraph()
+    graph.graph['crs'] = 'epsg:4326'
+    for node_id, row in nodes.iterrows():
+        graph.add_node(node_id, y=row['y'], x=row['x'], name=row['name'])
+
+    speed_kmh = 80
+    for u, v, distance in connections[['u', 'v', 'distance']].itertuples(index=False):
+        for source, target in ((u, v), (v, u)):
+            graph.add_edge(source, target,
+                           length=distance * 1000,
+                           travel_time=(distance / speed_kmh) * 60 * 60,
+                           name=f"Railroad {source}-{target}",
+                           highway="railway")
+    return graph
+
+def build_vectorized(nodes, connections):
+    """Construção atual: arestas direcionadas em colunas e carga em um único passo"""
+    forward = connections[['u', 'v', 'distance']]
+    backward = forward.rename(columns={'u': 'v', 'v': 'u'})
+    edges = pd.concat([forward, backward], ignore_index=True)
+
+    speed_kmh = 80
+    edges['length'] = edges['distance'] * 1000
+    edges['travel_time'] = (edges['distance'] / speed_kmh) * 60 * 60
+    edges['name'] = "Railroad " + edges['u'].astype(str) + "-" + edges['v'].astype(str)
+    edges['highway'] = "railway"
+
+    return CityGraph.build_graph(nodes, edges.drop(columns='distance'))
+
+def measure(build, nodes, connections, repeats=3):
+    """Medir o melhor tempo e o pico de memória de uma construção"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        build(nodes, connections)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    graph = build(nodes, connections)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return min(timings), peak, graph
+
+def main():
+    sizes = [(27, 40), (1000, 5000), (10000, 50000), (50000, 250000)]
+
+    print(f"{'nós':>8} {'conexões':>10} {'construção':>16} {'arestas':>9} {'tempo (s)':>10} {'pico (MB)':>10}")
+    for n_nodes, n_connections in sizes:
+        nodes, connections = make_network(n_nodes, n_connections)
+        builds = [
+            ('por aresta', build_per_edge),
+            ('dir. por aresta', build_per_edge_directed),
+            ('vetorizada', build_vectorized)
+        ]
+        for label, build in builds:
+            elapsed, peak, graph = measure(build, nodes, connections)
+            print(f"{n_nodes:>8} {n_connections:>10} {label:>16} {graph.number_of_edges():>9} "
+                  f"{elapsed:>10.4f} {peak / 1e6:>10.2f}")
+
+if __name__ == "__main__":
+    main()
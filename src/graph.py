@@ -2,6 +2,7 @@ import networkx as nx
 import osmnx as ox
 import os
 import pickle
+import hashlib
 import pandas as pd
 import geopandas as gpd
 from shapely.geometry import Point
@@ -13,6 +14,7 @@ class CityGraph:
         self.graph = None
         self.nodes = None
         self.edges = None
+        self.graph_version = None
         
     def load_or_download_map(self, force_download=False):
         """Carregar mapa do cache ou baixar do OpenStreetMap"""
@@ -23,15 +25,17 @@ class CityGraph:
             print("Carregando rede ferroviária do cache...")
             with open(cache_file, 'rb') as f:
                 data = pickle.load(f)
-                self.graph = data['graph']
-                self.nodes = data['nodes']
-                self.edges = data['edges']
+            
+            # Caches antigos guardam um grafo não direcionado; nesse caso, recriar a rede
+            if not isinstance(data['graph'], nx.MultiDiGraph):
+                return self.load_or_download_map(force_download=True)
+            
+            self.graph = data['graph']
+            self.nodes = data['nodes']
+            self.edges = data['edges']
         else:
             # Se não existir mapa do OpenStreetMap, criar um mapa simplificado
             print(f"Criando rede ferroviária para {self.country_name}...")
-            self.graph = nx.Graph()
-            # Adicionar atributo CRS ao grafo (EPSG:4326 - WGS84)
-            self.graph.graph['crs'] = 'epsg:4326'
             
             # Capitais com suas coordenadas (lat, lon)
             cities = {
@@ -64,17 +68,12 @@ class CityGraph:
                 'Macapá': (0.0356, -51.0705)        
             }
             
-            # Adicionar nós (cidades)
+            # Dados dos nós (cidades), com atributos correspondentes à estrutura do grafo OSM
             node_id = 0
             city_nodes = {}
             node_data = []
             
             for city, coords in cities.items():
-                # Adicionar atributos de nó correspondentes à estrutura do grafo OSM
-                self.graph.add_node(node_id, 
-                                    y=coords[0],  # latitude
-                                    x=coords[1],  # longitude
-                                    name=city)
                 city_nodes[city] = node_id
                 
                 # Armazenar dados de nó para GeoDataFrame
@@ -90,6 +89,8 @@ class CityGraph:
             
             # Adicionar arestas (conexões ferroviárias) com base na imagem
             # Distâncias medidas em linha reta pelo https://www.distancefromto.net/
+            # Formato: (origem, destino, distância[, distância de volta]); sem o quarto valor a
+            # volta tem a mesma distância, e com None o trecho é de mão única (só origem -> destino)
             railroad_connections = [
                 ('São Paulo', 'Rio de Janeiro', 360),
                 ('São Paulo', 'Belo Horizonte', 490),
@@ -133,45 +134,39 @@ class CityGraph:
                 ('Brasília', 'Palmas', 623),
             ]
             
-            # Armazenar dados de aresta para GeoDataFrame
-            edge_data = []
-            
-            # Adicionar arestas com atributos
-            for city1, city2, distance in railroad_connections:
-                if city1 in city_nodes and city2 in city_nodes:
-                    node1 = city_nodes[city1]
-                    node2 = city_nodes[city2]
-                    
-                    # Calculate travel time (assuming 80 km/h train speed)
-                    speed_kmh = 80
-                    travel_time = (distance / speed_kmh) * 60 * 60  # seconds
-                    
-                    # Edge attributes
-                    edge_attrs = {
-                        'length': distance * 1000,  # meters
-                        'travel_time': travel_time,  # seconds
-                        'name': f"Railroad {city1}-{city2}",
-                        'highway': "railway"
-                    }
-                    
-                    # Add edge to graph
-                    self.graph.add_edge(node1, node2, **edge_attrs)
-                    
-                    # Armazenar dados de aresta para GeoDataFrame
-                    edge_data.append({
-                        'u': node1,
-                        'v': node2,
-                        **edge_attrs
-                    })
+            # Montar as arestas em colunas: cada conexão gera um sentido de ida e, se não for
+            # de mão única, um de volta com o seu próprio peso; linhas paralelas não se sobrescrevem
+            connections = pd.DataFrame(
+                [connection if len(connection) == 4 else (*connection, connection[2])
+                 for connection in railroad_connections],
+                columns=['from_city', 'to_city', 'distance', 'reverse_distance']
+            )
+            connections['u'] = connections['from_city'].map(city_nodes)
+            connections['v'] = connections['to_city'].map(city_nodes)
+            connections = connections.dropna(subset=['u', 'v'])
+            connections['name'] = "Railroad " + connections['from_city'] + "-" + connections['to_city']
             
-            print(f"Rede ferroviária criada com {len(self.graph.nodes)} nós e {len(self.graph.edges)} arestas")
+            forward = connections[['u', 'v', 'distance', 'name']]
+            backward = (connections.dropna(subset=['reverse_distance'])
+                        [['v', 'u', 'reverse_distance', 'name']]
+                        .rename(columns={'v': 'u', 'u': 'v', 'reverse_distance': 'distance'}))
+            edges = pd.concat([forward, backward], ignore_index=True)
+            edges[['u', 'v']] = edges[['u', 'v']].astype(int)
+            edges['key'] = edges.groupby(['u', 'v']).cumcount()
+            
+            # Calcular tempo de viagem (assumindo trem a 80 km/h)
+            speed_kmh = 80
+            edges['length'] = edges['distance'] * 1000  # metros
+            edges['travel_time'] = (edges['distance'] / speed_kmh) * 60 * 60  # segundos
+            edges['highway'] = "railway"
             
-            # Criar GeoDataFrames diretamente
             self.nodes = gpd.GeoDataFrame(node_data, crs="EPSG:4326")
             self.nodes.set_index('node_id', inplace=True)
+            self.edges = edges.drop(columns='distance')
             
-            # Criar GeoDataFrames diretamente
-            self.edges = pd.DataFrame(edge_data)
+            self.graph = self.build_graph(self.nodes, self.edges)
+            
+            print(f"Rede ferroviária criada com {len(self.graph.nodes)} nós e {len(self.graph.edges)} arestas")
             
             # Salvar no cache
             os.makedirs(os.path.dirname(cache_file), exist_ok=True)
@@ -182,8 +177,46 @@ class CityGraph:
                     'edges': self.edges
                 }, f)
         
+        self.graph_version = None
         return self.graph
     
+    @staticmethod
+    def build_graph(nodes, edges):
+        """Montar o grafo direcionado com arestas paralelas a partir dos DataFrames de nós e arestas"""
+        graph = nx.MultiDiGraph()
+        # Adicionar atributo CRS ao grafo (EPSG:4326 - WGS84)
+        graph.graph['crs'] = 'epsg:4326'
+        
+        graph.add_nodes_from(zip(nodes.index, nodes[['y', 'x', 'name']].to_dict('records')))
+        
+        # Chave de cada aresta paralela: posição entre as arestas com o mesmo (u, v)
+        if 'key' not in edges.columns:
+            edges = edges.assign(key=edges.groupby(['u', 'v']).cumcount())
+        
+        # Montar os atributos a partir das colunas (mais rápido que to_dict('records'))
+        attr_columns = [column for column in edges.columns if column not in ('u', 'v', 'key')]
+        attrs = [dict(zip(attr_columns, values))
+                 for values in zip(*(edges[column].tolist() for column in attr_columns))]
+        
+        graph.add_edges_from(zip(edges['u'].tolist(), edges['v'].tolist(), edges['key'].tolist(), attrs))
+        
+        return graph
+    
+    def get_graph_version(self):
+        """Obter um identificador estável do conteúdo do grafo (nós e arestas)"""
+        if self.graph is None:
+            raise Exception("Grafo não Existe. Crie utilizando load_or_download_map() primeiro.")
+        
+        if self.graph_version is None:
+            digest = hashlib.sha1()
+            for node, data in sorted(self.graph.nodes(data=True)):
+                digest.update(repr((node, sorted(data.items()))).encode('utf-8'))
+            for u, v, key, data in sorted(self.graph.edges(keys=True, data=True), key=lambda e: e[:3]):
+                digest.update(repr((u, v, key, sorted(data.items()))).encode('utf-8'))
+            self.graph_version = digest.hexdigest()[:12]
+        
+        return self.graph_version
+    
     def get_nearest_node(self, point):
         """Encontrar o nó mais próximo a um ponto (lat, lng)"""
         return ox.distance.nearest_nodes(self.graph, point[1], point[0])
@@ -200,7 +233,9 @@ class CityGraph:
         edge_details = []
         for i in range(len(path) - 1):
             u, v = path[i], path[i + 1]
-            edge_data = self.graph.get_edge_data(u, v)
+            # Entre arestas paralelas no sentido u -> v, usar a de menor peso, como o Dijkstra
+            # (que considera peso 1 quando o atributo não existe)
+            edge_data = min(self.graph[u][v].values(), key=lambda data: data.get(weight, 1))
             
             # Obter os nomes das cidades para melhores direções
             u_name = self.graph.nodes[u].get('name', 'Unknown')
@@ -6,6 +6,7 @@ from graph import CityGraph
 from ui import NavigationUI
 sys.path.append(os.path.join(os.path.dirname(os.path.dirname(__file__)), 'visualization'))
 from map_viz import MapVisualizer
+from map_export import MapExporter
 
 def main():
     print("=" * 50)
@@ -25,7 +26,15 @@ def main():
     # Inicializa o visualizador
     visualizer = MapVisualizer(city_graph)
     
+    # Inicializa a exportação de mapas em segundo plano
+    maps_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'maps')
+    exporter = MapExporter(visualizer, maps_dir)
+    
     while True:
+        # Relatar falhas das exportações em segundo plano sem interromper o prompt
+        for failed_file, error in exporter.pop_errors():
+            print(f"\nErro ao salvar o mapa em {failed_file}: {error}")
+        
         print("\n" + "=" * 50)
         print("Menu de Navegação Ferroviária:")
         print("1. Encontrar uma rota de trem")
@@ -48,11 +57,10 @@ def main():
             # Print route details
             ui.print_route_details(route, inputs)
             
-            # Save the map to an HTML file
-            output_file = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'railway_route_map.html')
-            visualizer.save_map_to_html(output_file, route)
+            # Agenda a exportação do mapa em segundo plano
+            output_file, _ = exporter.submit(route)
             
-            print(f"\nMapa de rota ferroviária salvo para {output_file}")
+            print(f"\nMapa de rota ferroviária sendo salvo em {output_file}")
             print("Você pode abrir este arquivo em um navegador da web para visualizar a rota.")
             
         elif choice == '2':
@@ -61,6 +69,7 @@ def main():
         elif choice == '3':
             print("\nObrigado por usar o Sistema Brasil sobre Trilhos!")
             print("Saindo...")
+            exporter.shutdown()
             break
             
         else:
@@ -0,0 +1,150 @@
+import os
+import gzip
+import hashlib
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, Future
+
+class MapExporter:
+    # Temporários mais antigos que isso são sobras de processos interrompidos durante a escrita
+    stale_tmp_seconds = 10 * 60
+
+    def __init__(self, visualizer, output_dir, use_gzip=False, max_files=32):
+        self.visualizer = visualizer
+        self.output_dir = output_dir
+        self.use_gzip = use_gzip
+        self.max_files = max_files
+        # Um único worker: o folium não é thread-safe e a escrita fica serializada
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='map-export')
+        self.pending = {}
+        self.errors = []
+        self.lock = threading.Lock()
+        os.makedirs(self.output_dir, exist_ok=True)
+
+    def get_map_path(self, route=None):
+        """Obter o caminho do arquivo endereçado pelo conteúdo da rota e versão do grafo"""
+        graph_version = self.visualizer.city_graph.get_graph_version()
+
+        # A chave cobre tudo o que o mapa exibe: caminho, arestas escolhidas e totais
+        content = [graph_version]
+        if route and 'path' in route:
+            content.append(route['path'])
+            content.append([
+                (edge['from'], edge['to'], edge['name'], edge['length'], edge['travel_time'])
+                for edge in route.get('edge_details', [])
+            ])
+            content.append((route.get('total_distance'), route.get('total_time')))
+        digest = hashlib.sha1(repr(content).encode('utf-8')).hexdigest()[:16]
+
+        extension = '.html.gz' if self.use_gzip else '.html'
+        return os.path.join(self.output_dir, f"railway_route_{digest}{extension}")
+
+    def submit(self, route=None):
+        """Agendar a exportação do mapa em segundo plano e retornar (caminho, future)"""
+        filepath = self.get_map_path(route)
+
+        with self.lock:
+            # Rota já exportada: reaproveitar o arquivo existente. Atualizar o mtime é só
+            # uma dica para a remoção; pode falhar se o arquivo for de outro usuário
+            try:
+                os.utime(filepath)
+            except OSError:
+                pass
+            if os.path.exists(filepath):
+                future = Future()
+                future.set_result(filepath)
+                return filepath, future
+
+            # Rota já na fila: reaproveitar a mesma tarefa
+            if filepath in self.pending:
+                return filepath, self.pending[filepath]
+
+            future = self.executor.submit(self._export, filepath, route)
+            self.pending[filepath] = future
+
+        future.add_done_callback(lambda done: self._on_export_done(filepath, done))
+        return filepath, future
+
+    def shutdown(self, wait=True):
+        """Aguardar as exportações pendentes e encerrar o worker"""
+        self.executor.shutdown(wait=wait)
+
+    def pop_errors(self):
+        """Retornar e limpar os erros das exportações concluídas desde a última chamada"""
+        with self.lock:
+            errors, self.errors = self.errors, []
+        return errors
+
+    def _on_export_done(self, filepath, future):
+        # Executado na thread do worker: guardar o erro em vez de imprimir sobre o menu
+        with self.lock:
+            self.pending.pop(filepath, None)
+            if future.exception() is not None:
+                self.errors.append((filepath, future.exception()))
+                return
+
+        # A remoção de mapas antigos fica fora da exportação: falhar nela não invalida o mapa gravado
+        self._evict()
+
+    def _export(self, filepath, route):
+        """Gerar o HTML e gravá-lo de forma atômica"""
+        html = self.visualizer.render_map_html(route).encode('utf-8')
+
+        # Gravar em arquivo temporário único (também entre processos) e renomear,
+        # evitando leituras de arquivos parciais
+        fd, tmp_path = tempfile.mkstemp(prefix='railway_route_', suffix='.tmp', dir=self.output_dir)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                if self.use_gzip:
+                    with gzip.GzipFile(fileobj=f, mode='wb') as gz:
+                        gz.write(html)
+                else:
+                    f.write(html)
+            # mkstemp cria o arquivo só para o dono; o mapa deve ser legível pelos demais usuários
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, filepath)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        return filepath
+
+    def _evict(self):
+        """Remover os mapas menos usados recentemente quando o cache excede max_files"""
+        # Outros processos e usuários compartilham o diretório: arquivos podem sumir ou
+        # não poder ser removidos a qualquer momento, então cada erro é ignorado por arquivo
+        with self.lock:
+            try:
+                names = os.listdir(self.output_dir)
+            except OSError:
+                return
+
+            now = time.time()
+            mtimes = {}
+            for name in names:
+                if not name.startswith('railway_route_'):
+                    continue
+                filepath = os.path.join(self.output_dir, name)
+                try:
+                    mtime = os.path.getmtime(filepath)
+                    if name.endswith('.tmp'):
+                        # Temporário abandonado por um processo interrompido
+                        if now - mtime > self.stale_tmp_seconds:
+                            os.remove(filepath)
+                    elif name.endswith(('.html', '.html.gz')):
+                        mtimes[filepath] = mtime
+                except OSError:
+                    pass
+
+            if len(mtimes) <= self.max_files:
+                return
+
+            files = sorted(mtimes, key=mtimes.get)
+            for filepath in files[:len(files) - self.max_files]:
+                if filepath not in self.pending:
+                    try:
+                        os.remove(filepath)
+                    except OSError:
+                        pass
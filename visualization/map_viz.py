@@ -7,6 +7,17 @@ class MapVisualizer:
     def __init__(self, city_graph):
         self.city_graph = city_graph
     
+    def get_railway_segments(self):
+        """Obter as ferrovias a desenhar, uma vez por linha, ignorando o sentido das arestas"""
+        seen = set()
+        segments = []
+        for u, v, data in self.city_graph.graph.edges(data=True):
+            segment = (frozenset((u, v)), data.get('name'))
+            if segment not in seen:
+                seen.add(segment)
+                segments.append((u, v, data))
+        return segments
+    
     def plot_map_with_matplotlib(self, route=None, figsize=(12, 10)):
         """Plotar o mapa usando matplotlib"""
         if self.city_graph.graph is None:
@@ -22,7 +33,7 @@ class MapVisualizer:
         ax.scatter(node_Xs, node_Ys, s=50, c='#B22222', zorder=2)
         
         # Plotar arestas (ferrovias)
-        for u, v, data in self.city_graph.graph.edges(data=True):
+        for u, v, data in self.get_railway_segments():
             ax.plot([self.city_graph.graph.nodes[u]['x'], self.city_graph.graph.nodes[v]['x']],
                     [self.city_graph.graph.nodes[u]['y'], self.city_graph.graph.nodes[v]['y']],
                     c='#FFD700', linewidth=1.5, alpha=0.7, zorder=1)
@@ -74,7 +85,7 @@ class MapVisualizer:
         )
         
         # Adicionar todas as ferrovias ao mapa
-        for u, v, data in self.city_graph.graph.edges(data=True):
+        for u, v, data in self.get_railway_segments():
             # Obter coordenadas dos nós
             u_lat = self.city_graph.graph.nodes[u]['y']
             u_lng = self.city_graph.graph.nodes[u]['x']
@@ -172,8 +183,8 @@ class MapVisualizer:
         m = self.create_folium_map(route)
         display(m)
         
-    def save_map_to_html(self, filepath, route=None):
-        """Save the map to an HTML file"""
+    def render_map_html(self, route=None):
+        """Gerar o HTML completo do mapa sem gravá-lo em disco"""
         m = self.create_folium_map(route)
         
         # Adicionar mensagem de fallback caso os tiles não carreguem
@@ -192,5 +203,12 @@ class MapVisualizer:
         </script>
         """))
         
-        m.save(filepath)
+        return m.get_root().render()
+        
+    def save_map_to_html(self, filepath, route=None):
+        """Save the map to an HTML file"""
+        html = self.render_map_html(route)
+        
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(html)
         print(f"Mapa salvo em {filepath}") 
\ No newline at end of file